@@ -0,0 +1,156 @@
+"""
+Shared runner for the PlantGrow phase test scripts.
+
+A phase suite is a list of (title, case) pairs. Cases run in order and
+receive the PhaseTester, recording results with tester.test(). A case that
+returns False stops the suite (e.g. when the executable is missing).
+
+Tree generation for the suite's configs is dispatched to a thread pool when
+the suite starts, so the generator processes run side by side while the
+cases report in order; tester.generate() waits for a config's result. Each
+run's messages are collected while it runs and printed when its case asks for
+the result, so they land under that case rather than wherever the worker
+thread happens to be. The generator processes are kept alive and reused for
+the whole suite.
+"""
+
+import io
+import os
+import sys
+
+from tests._util import exists
+from tree_gen import TreeGeneratorPool, count_usd_token, scan_usd
+
+class PhaseTester:
+    def __init__(self, phase, subject, cases, configs=(), next_steps=()):
+        """
+        Args:
+            phase: Phase number, used in headers and the summary
+            subject: What the phase tests, e.g. "Tropism System"
+            cases: List of (title, case) pairs; case(tester) runs one test group
+            configs: Config files the cases generate trees from
+            next_steps: Lines printed after the summary when all tests pass
+        """
+        self.generator = TreeGeneratorPool()
+        self.phase = phase
+        self.subject = subject
+        self.cases = cases
+        self.configs = list(configs)
+        self.next_steps = list(next_steps)
+        self.passed_tests = 0
+        self.failed_tests = 0
+        # Scratch space for values one case hands to a later one
+        self.state = {}
+        self._generations = {}
+        # Mapped USD files and regex sweeps over them, shared between cases
+        self._usd_cache = {}
+        self._match_cache = {}
+
+    def test(self, name, condition, message=""):
+        """Helper to run a test; its report is written to stdout in one call"""
+        buf = io.StringIO()
+        print(f"\n  Test: {name}", file=buf)
+        if condition:
+            print(f"    ✓ PASS", file=buf)
+            self.passed_tests += 1
+        else:
+            print(f"    ✗ FAIL", file=buf)
+            self.failed_tests += 1
+        if message:
+            print(f"      {message}", file=buf)
+
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+        return bool(condition)
+
+    def generate(self, config_path):
+        """Generate a tree from a config, waiting for the run started by run() if any."""
+        future = self._generations.get(config_path)
+        if future is None:
+            return self.generator.generate(config_path, verbose=False)
+
+        success, log = future.result()
+        if log:
+            sys.stdout.write(log)
+            sys.stdout.flush()
+        return success
+
+    def _generate_buffered(self, config_path):
+        """Generate on a worker thread, returning (success, collected messages)."""
+        log = io.StringIO()
+        return self.generator.generate(config_path, verbose=False, output=log), log.getvalue()
+
+    def load_usd(self, path):
+        """Map a USD file once per suite run (see tree_gen.scan_usd)."""
+        content = self._usd_cache.get(path)
+        if content is None:
+            content = self._usd_cache[path] = scan_usd(path)
+        return content
+
+    def usd_contains(self, path, token):
+        """Whether a USD file contains a byte string; stops at the first occurrence."""
+        return self.load_usd(path).find(token) != -1
+
+    def usd_count(self, path, token):
+        """Number of occurrences of a byte string in a USD file."""
+        return count_usd_token(self.load_usd(path), token)
+
+    def usd_matches(self, path, regex):
+        """
+        regex.findall() over a USD file, computed once per (path, regex) and
+        shared by all cases.
+        """
+        key = (path, regex)
+        matches = self._match_cache.get(key)
+        if matches is None:
+            matches = self._match_cache[key] = regex.findall(self.load_usd(path))
+        return matches
+
+    def run(self):
+        """Run all cases, then print the summary. Returns True if all tests passed."""
+        # Imported here so importing a phase module for its cases stays cheap
+        from concurrent.futures import ThreadPoolExecutor
+
+        print("="*60)
+        print(f"PlantGrow - Phase {self.phase} Test Suite")
+        print(f"Testing: {self.subject}")
+        print("="*60)
+
+        # Without an executable there's nothing to dispatch; the build case
+        # reports that and stops the suite
+        workers = 0
+        if exists(self.generator.executable):
+            workers = min(len(self.configs), (os.cpu_count() or 1) - 2)
+
+        with self.generator, ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            if workers > 0:
+                self._generations = {
+                    config_path: executor.submit(self._generate_buffered, config_path)
+                    for config_path in self.configs
+                }
+
+            for i, (title, case) in enumerate(self.cases, start=1):
+                print(f"\n[Test {i}] {title}")
+                if case(self) is False:
+                    break
+
+        return self.summary()
+
+    def summary(self):
+        """Print test summary"""
+        print("\n" + "="*60)
+        print("Test Summary")
+        print("="*60)
+        print(f"Passed: {self.passed_tests}")
+        print(f"Failed: {self.failed_tests}")
+        print(f"Total:  {self.passed_tests + self.failed_tests}")
+
+        if self.failed_tests == 0:
+            print(f"\n✓ All tests passed! Phase {self.phase} checkpoint complete.")
+            for line in self.next_steps:
+                print(line)
+            return True
+        else:
+            print(f"\n✗ {self.failed_tests} test(s) failed.")
+            print(f"Please fix the issues before proceeding to Phase {self.phase + 1}.")
+            return False
@@ -0,0 +1,39 @@
+"""
+Shared helpers for the PlantGrow test scripts.
+"""
+
+import os
+
+# Directory listings keyed by normalized directory path, see exists()
+_SCANS = {}
+
+def dir_set(directory):
+    """Names of the entries in a directory, from a single scan (empty if missing)."""
+    if not os.path.isdir(directory):
+        return set()
+    with os.scandir(directory) as entries:
+        return {entry.name for entry in entries}
+
+def exists(path):
+    """
+    Whether a path exists, answered from a cached scan of its directory.
+
+    Each directory is scanned once; call rescan() after creating files in it.
+    """
+    directory, name = os.path.split(os.path.normpath(path))
+    directory = directory or "."
+    names = _SCANS.get(directory)
+    if names is None:
+        names = _SCANS[directory] = dir_set(directory)
+    return name in names
+
+def rescan(directory):
+    """Forget the cached listing of a directory so exists() scans it again."""
+    _SCANS.pop(os.path.normpath(directory), None)
+
+def executable_built(build_dir="build"):
+    """Whether the plantgrow executable exists in any of the known build layouts."""
+    return any(
+        exists(os.path.join(build_dir, name))
+        for name in ("plantgrow", "Debug/plantgrow.exe", "Release/plantgrow.exe")
+    )
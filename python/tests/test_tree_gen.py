@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+PlantGrow - tree_gen wrapper tests
+Tests: TreeGenerator output caching, TreeGeneratorPool worker reuse,
+       load_config reloading, USD token counting, cached exists()/rescan()
+
+Uses small shell scripts in a temporary directory in place of the plantgrow
+executable, so no build is needed.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from tests import _util
+from tests._util import exists, rescan
+from tree_gen import (
+    TreeGenerator, TreeGeneratorPool, count_usd_token, load_config, scan_usd
+)
+
+# Writes a complete USD file and succeeds
+GOOD_GENERATOR = """#!/bin/sh
+printf '#usda 1.0\\ndef Xform "Tree"\\n{\\n}\\n' > "{usd_path}"
+"""
+
+# Truncates the USD file mid-export and fails
+FAILING_GENERATOR = """#!/bin/sh
+printf '#usda 1.0\\n' > "{usd_path}"
+exit 1
+"""
+
+# --stdin-mode worker that reports success for every config
+GOOD_WORKER = """#!/bin/sh
+while read -r config; do
+    echo "__DONE__ 0"
+done
+"""
+
+# --stdin-mode worker whose completion marker can't be parsed
+MALFORMED_WORKER = """#!/bin/sh
+while read -r config; do
+    echo "__DONE__ oops"
+done
+"""
+
+def install_script(path, script):
+    with open(path, 'w') as f:
+        f.write(script)
+    os.chmod(path, 0o755)
+
+class TreeGeneratorCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.usd_path = os.path.join(self.tmp.name, "tree.usda")
+        self.config_path = os.path.join(self.tmp.name, "tree.json")
+        self.executable = os.path.join(self.tmp.name, "plantgrow")
+        with open(self.config_path, 'w') as f:
+            json.dump({"output": {"usd_path": self.usd_path}}, f)
+
+    def install_generator(self, script):
+        install_script(self.executable, script.replace("{usd_path}", self.usd_path))
+        # Keep the inputs older than any output the generator writes
+        os.utime(self.executable, (0, 0))
+        os.utime(self.config_path, (0, 0))
+
+    def test_successful_run_is_reused(self):
+        self.install_generator(GOOD_GENERATOR)
+        generator = TreeGenerator(self.executable)
+        self.assertTrue(generator.generate(self.config_path, verbose=False))
+
+        # A failing generator must not be run at all on a cache hit
+        self.install_generator(FAILING_GENERATOR)
+        self.assertTrue(generator.generate(self.config_path, verbose=False))
+
+    def test_failed_run_is_not_reused(self):
+        self.install_generator(GOOD_GENERATOR)
+        generator = TreeGenerator(self.executable)
+        self.assertTrue(generator.generate(self.config_path, verbose=False))
+
+        # Force a run that rewrites the output and then fails
+        os.utime(self.usd_path, (0, 0))
+        self.install_generator(FAILING_GENERATOR)
+        self.assertFalse(generator.generate(self.config_path, verbose=False))
+
+        # The truncated output is newer than its inputs but must not count
+        # as up to date
+        self.assertFalse(os.path.exists(self.usd_path + ".hash"))
+        self.assertFalse(generator.generate(self.config_path, verbose=False))
+
+class TreeGeneratorPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.config_path = os.path.join(self.tmp.name, "tree.json")
+        self.executable = os.path.join(self.tmp.name, "plantgrow")
+        with open(self.config_path, 'w') as f:
+            json.dump({}, f)
+        self.pool = TreeGeneratorPool(self.executable, use_cache=False, size=1)
+        self.addCleanup(self.pool.close)
+
+    def test_malformed_marker_discards_worker(self):
+        install_script(self.executable, MALFORMED_WORKER)
+        self.assertFalse(self.pool.generate(self.config_path, verbose=False))
+        self.assertEqual(self.pool._idle, [])
+
+        install_script(self.executable, GOOD_WORKER)
+        self.assertTrue(self.pool.generate(self.config_path, verbose=False))
+
+    def test_dead_idle_worker_is_replaced(self):
+        install_script(self.executable, GOOD_WORKER)
+        self.assertTrue(self.pool.generate(self.config_path, verbose=False))
+
+        [worker] = self.pool._idle
+        worker.kill()
+        worker.wait()
+
+        self.assertTrue(self.pool.generate(self.config_path, verbose=False))
+        self.assertNotIn(worker, self.pool._idle)
+
+class LoadConfigTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.config_path = os.path.join(self.tmp.name, "tree.json")
+
+    def write_config(self, config, mtime):
+        with open(self.config_path, 'w') as f:
+            json.dump(config, f)
+        os.utime(self.config_path, (mtime, mtime))
+
+    def test_unchanged_file_is_reused(self):
+        self.write_config({"iterations": 3}, 1000)
+        self.assertIs(load_config(self.config_path), load_config(self.config_path))
+
+    def test_modified_file_is_reloaded(self):
+        self.write_config({"iterations": 3}, 1000)
+        self.assertEqual(load_config(self.config_path), {"iterations": 3})
+
+        self.write_config({"iterations": 4}, 2000)
+        self.assertEqual(load_config(self.config_path), {"iterations": 4})
+
+class CountUsdTokenTest(unittest.TestCase):
+    USD = b'#usda 1.0\ndef Xform "Tree"\n{\n    def BasisCurves "b0"\n    def BasisCurves "b1"\n}\n'
+
+    def test_counts_bytes(self):
+        self.assertEqual(count_usd_token(self.USD, b"def BasisCurves"), 2)
+        # A token inside a longer one is still counted
+        self.assertEqual(count_usd_token(self.USD, b"BasisCurves"), 2)
+        self.assertEqual(count_usd_token(self.USD, b"def Mesh"), 0)
+
+    def test_counts_are_non_overlapping(self):
+        self.assertEqual(count_usd_token(b"aaa", b"aa"), 1)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "aaa")
+            with open(path, 'wb') as f:
+                f.write(b"aaa")
+
+            content = scan_usd(path)
+            try:
+                self.assertEqual(count_usd_token(content, b"aa"), 1)
+            finally:
+                content.close()
+
+    def test_counts_mapped_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            usd_path = os.path.join(tmp, "tree.usda")
+            with open(usd_path, 'wb') as f:
+                f.write(self.USD)
+
+            content = scan_usd(usd_path)
+            try:
+                self.assertEqual(count_usd_token(content, b"def BasisCurves"), 2)
+                self.assertEqual(count_usd_token(content, b"def Mesh"), 0)
+            finally:
+                content.close()
+
+    def test_counts_empty_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            usd_path = os.path.join(tmp, "empty.usda")
+            open(usd_path, 'wb').close()
+            self.assertEqual(count_usd_token(scan_usd(usd_path), b"def BasisCurves"), 0)
+
+class ExistsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        _util._SCANS.clear()
+        self.addCleanup(_util._SCANS.clear)
+
+    def touch(self, name):
+        open(os.path.join(self.tmp.name, name), 'w').close()
+
+    def test_missing_file_is_cached_until_rescan(self):
+        path = os.path.join(self.tmp.name, "tree.usda")
+        self.assertFalse(exists(path))
+
+        self.touch("tree.usda")
+        self.assertFalse(exists(path))
+
+        rescan(self.tmp.name)
+        self.assertTrue(exists(path))
+
+    def test_paths_are_normalized(self):
+        os.mkdir(os.path.join(self.tmp.name, "sub"))
+        self.touch("tree.usda")
+        self.assertTrue(exists(os.path.join(self.tmp.name, "sub", "..", "tree.usda")))
+        self.assertTrue(exists(os.path.join(self.tmp.name, "tree.usda") + os.sep))
+
+        # Both spellings share one cached listing
+        self.touch("late.usda")
+        rescan(os.path.join(self.tmp.name, "sub", ".."))
+        self.assertTrue(exists(os.path.join(self.tmp.name, "late.usda")))
+
+    def test_bare_names_use_current_directory(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+        self.touch("tree.usda")
+        self.assertTrue(exists("tree.usda"))
+        self.assertTrue(exists(os.path.join(".", "tree.usda")))
+        self.assertFalse(exists("late.usda"))
+
+        self.touch("late.usda")
+        rescan(".")
+        self.assertTrue(exists("late.usda"))
+
+if __name__ == "__main__":
+    unittest.main()
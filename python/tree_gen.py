@@ -6,81 +6,349 @@ Phase 1: Foundation & Basic Growth
 This script provides a Python interface to the C++ tree generator.
 """
 
-import subprocess
+import io
+import json
+import mmap
+import re
 import sys
 import os
-from pathlib import Path
+import threading
+
+# Parsed configs keyed by (path, mtime) so edited files are picked up again
+_CONFIG_CACHE = {}
+
+def load_config(config_path):
+    """
+    Load a JSON configuration file, reusing the parsed result while the
+    file is unchanged on disk.
+
+    The returned dict is shared between callers and must not be modified.
+    """
+    key = (config_path, os.stat(config_path).st_mtime)
+    config = _CONFIG_CACHE.get(key)
+    if config is None:
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+        _CONFIG_CACHE[key] = config
+    return config
+
+def scan_usd(usd_path):
+    """
+    Map a generated USD file read-only for scanning.
+
+    Returns a bytes-like object supporting find/count and bytes regexes,
+    without reading the file into a Python string.
+    """
+    with open(usd_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap cannot map empty files
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def count_usd_token(content, token):
+    """
+    Count non-overlapping occurrences of a byte string in USD content.
+
+    Args:
+        content: bytes-like USD content, e.g. from scan_usd
+        token: Byte string to count
+
+    Returns:
+        Number of occurrences
+    """
+    # mmap only has count() from Python 3.13; a single-literal findall is the
+    # next fastest C-level scan
+    count = getattr(content, "count", None)
+    if count is not None:
+        return count(token)
+    return len(re.findall(re.escape(token), content))
+
+def _config_digest(config_path):
+    """Content hash of a config file, used to tell whether its output is current."""
+    import hashlib
+
+    with open(config_path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+def _config_output_path(config_path):
+    """The USD output path named by a config, or None if it can't be determined."""
+    try:
+        return load_config(config_path)["output"]["usd_path"]
+    except (ValueError, KeyError, TypeError):
+        return None
 
 class TreeGenerator:
-    def __init__(self, executable_path="./build/plantgrow"):
+    def __init__(self, executable_path="./build/plantgrow", use_cache=True):
+        """
+        Args:
+            executable_path: Path to the plantgrow executable
+            use_cache: Skip generation when a config's USD output is already
+                up to date (see generate)
+        """
         self.executable = executable_path
+        self.use_cache = use_cache
 
-    def generate(self, config_path, verbose=True):
+    def generate(self, config_path, verbose=True, output=None):
         """
         Generate a tree from a JSON configuration file.
 
+        With use_cache enabled, the generator is not run again if the USD
+        output exists, is newer than both the config and the executable, and
+        was produced from identical config contents (recorded in a
+        "<usd_path>.hash" sidecar file).
+
         Args:
             config_path: Path to JSON configuration file
             verbose: Print output from generator
+            output: Text stream that messages and generator output are written
+                to, including the generator's stderr (default: sys.stdout,
+                with stderr going to sys.stderr)
 
         Returns:
             True if successful, False otherwise
         """
+        out = sys.stdout if output is None else output
+
         if not os.path.exists(self.executable):
-            print(f"Error: Executable not found at {self.executable}")
-            print("Please build the project first:")
-            print("  mkdir -p build && cd build")
-            print("  cmake .. && cmake --build .")
+            print(f"Error: Executable not found at {self.executable}", file=out)
+            print("Please build the project first:", file=out)
+            print("  mkdir -p build && cd build", file=out)
+            print("  cmake .. && cmake --build .", file=out)
             return False
 
         if not os.path.exists(config_path):
-            print(f"Error: Config file not found: {config_path}")
+            print(f"Error: Config file not found: {config_path}", file=out)
             return False
 
+        usd_path = digest = None
+        if self.use_cache:
+            usd_path = _config_output_path(config_path)
+            if usd_path is not None:
+                digest = _config_digest(config_path)
+                if self._output_up_to_date(config_path, usd_path, digest):
+                    if verbose:
+                        print(f"Output up to date, skipping generation: {usd_path}", file=out)
+                    return True
+
+                # The run may rewrite usd_path and then fail, so drop the old
+                # digest first; only a successful run writes it back
+                try:
+                    os.remove(usd_path + ".hash")
+                except FileNotFoundError:
+                    pass
+
+        success = self._run(config_path, verbose, output)
+
+        if success and digest is not None:
+            try:
+                with open(usd_path + ".hash", 'w') as f:
+                    f.write(digest)
+            except OSError:
+                pass
+
+        return success
+
+    def _output_up_to_date(self, config_path, usd_path, digest):
+        """Whether usd_path was generated from the current config and executable."""
+        try:
+            usd_mtime = os.path.getmtime(usd_path)
+            if usd_mtime <= os.path.getmtime(config_path):
+                return False
+            if usd_mtime <= os.path.getmtime(self.executable):
+                return False
+            with open(usd_path + ".hash", 'r') as f:
+                return f.read().strip() == digest
+        except OSError:
+            return False
+
+    def _run(self, config_path, verbose, output=None):
+        """Run the generator on a config, returning True if it succeeded."""
+        out = sys.stdout if output is None else output
+
+        # Imported here so importing tree_gen for its helpers stays cheap
+        import subprocess
+
         try:
-            result = subprocess.run(
+            if not verbose:
+                # Nothing will look at the output, so don't collect it at all
+                result = subprocess.run(
+                    [self.executable, config_path],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    check=False
+                )
+                return result.returncode == 0
+
+            # Echo generator output as it is produced rather than buffering it
+            with subprocess.Popen(
                 [self.executable, config_path],
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                check=False
-            )
+                bufsize=1
+            ) as proc:
+                for line in proc.stdout:
+                    out.write(line)
+                stderr = proc.stderr.read()
 
-            if verbose:
-                print(result.stdout)
-                if result.stderr:
-                    print(result.stderr, file=sys.stderr)
+            if stderr:
+                print(stderr, file=sys.stderr if output is None else output)
 
-            return result.returncode == 0
+            return proc.returncode == 0
 
         except Exception as e:
-            print(f"Error running generator: {e}")
+            print(f"Error running generator: {e}", file=out)
             return False
 
     def batch_generate(self, config_files, verbose=False):
         """
         Generate multiple trees from a list of config files.
 
+        Each config runs in its own generator process, so configs are
+        dispatched concurrently and reported as they finish. Output for each
+        config is collected while it runs and printed as one block under its
+        progress line, so concurrent runs don't interleave.
+
         Args:
             config_files: List of paths to JSON configuration files
             verbose: Print output from generator
 
         Returns:
-            Dictionary of {config_path: success_bool}
+            Dictionary of {config_path: success_bool}, in input order
         """
-        results = {}
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        results = dict.fromkeys(config_files, False)
+        total = len(results)
+        if total == 0:
+            return results
+
+        def generate_buffered(config_path):
+            log = io.StringIO()
+            return self.generate(config_path, verbose=verbose, output=log), log.getvalue()
 
-        for i, config_path in enumerate(config_files):
-            print(f"\n[{i+1}/{len(config_files)}] Generating from: {config_path}")
-            success = self.generate(config_path, verbose=verbose)
-            results[config_path] = success
+        max_workers = max(1, min(total, (os.cpu_count() or 1) - 2))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(generate_buffered, config_path): config_path
+                for config_path in results
+            }
+            for i, future in enumerate(as_completed(futures)):
+                config_path = futures[future]
+                success, log = future.result()
+                results[config_path] = success
 
-            if success:
-                print(f"  ✓ Success")
-            else:
-                print(f"  ✗ Failed")
+                print(f"\n[{i+1}/{total}] Generated from: {config_path}")
+                if log:
+                    sys.stdout.write(log)
+                if success:
+                    print(f"  ✓ Success")
+                else:
+                    print(f"  ✗ Failed")
 
         return results
 
+class TreeGeneratorPool(TreeGenerator):
+    """
+    TreeGenerator that keeps plantgrow processes running in --stdin-mode and
+    feeds them config paths, so process startup is paid once per worker
+    rather than once per tree.
+
+    Up to `size` workers are started on demand, one per concurrent generate
+    call. Use as a context manager, or call close() when done.
+    """
+
+    DONE_MARKER = "__DONE__ "
+
+    def __init__(self, executable_path="./build/plantgrow", use_cache=True, size=None):
+        super().__init__(executable_path, use_cache)
+        self.size = size or max(1, (os.cpu_count() or 1) - 2)
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._idle = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Shut down all idle worker processes."""
+        with self._lock:
+            workers, self._idle = self._idle, []
+        for proc in workers:
+            self._stop(proc)
+
+    def _run(self, config_path, verbose, output=None):
+        out = sys.stdout if output is None else output
+
+        with self._slots:
+            with self._lock:
+                proc = self._idle.pop() if self._idle else None
+
+            # An idle worker may have exited since its last run; if it can't
+            # take the config, retry once with a fresh one
+            if proc is not None:
+                try:
+                    self._send(proc, config_path)
+                except OSError:
+                    self._stop(proc)
+                    proc = None
+
+            try:
+                if proc is None:
+                    proc = self._spawn()
+                    self._send(proc, config_path)
+
+                for line in proc.stdout:
+                    if line.startswith(self.DONE_MARKER):
+                        exit_code = int(line[len(self.DONE_MARKER):])
+                        # Only a worker that reported back cleanly is reused
+                        with self._lock:
+                            self._idle.append(proc)
+                        return exit_code == 0
+                    if verbose:
+                        out.write(line)
+
+                print(f"Error running generator: worker exited while generating {config_path}", file=out)
+            except Exception as e:
+                print(f"Error running generator: {e}", file=out)
+
+            # The worker didn't report back, so it can't be reused
+            if proc is not None:
+                self._stop(proc)
+            return False
+
+    def _spawn(self):
+        import subprocess
+
+        return subprocess.Popen(
+            [self.executable, "--stdin-mode"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        )
+
+    @staticmethod
+    def _send(proc, config_path):
+        proc.stdin.write(config_path + "\n")
+        proc.stdin.flush()
+
+    @staticmethod
+    def _stop(proc):
+        import subprocess
+
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+
 def main():
     if len(sys.argv) < 2:
         print("PlantGrow - Tree Generation Wrapper")
@@ -91,18 +359,17 @@ def main():
         print(f"  {sys.argv[0]} configs/oak.json")
         return 1
 
-    generator = TreeGenerator()
-
     # Single file or multiple files
     config_files = sys.argv[1:]
 
     if len(config_files) == 1:
         # Single file generation
-        success = generator.generate(config_files[0], verbose=True)
+        success = TreeGenerator().generate(config_files[0], verbose=True)
         return 0 if success else 1
     else:
-        # Batch generation
-        results = generator.batch_generate(config_files, verbose=False)
+        # Batch generation, reusing worker processes across configs
+        with TreeGeneratorPool() as generator:
+            results = generator.batch_generate(config_files, verbose=False)
 
         # Summary
         success_count = sum(1 for v in results.values() if v)
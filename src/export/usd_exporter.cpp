@@ -4,9 +4,14 @@
 #include <iomanip>
 #include <filesystem>
 #include <system_error>
+#include <vector>
 
 namespace plantgrow {
 
+// Stream buffer size for exports, so large trees are written in a few big
+// write() calls instead of many small ones
+static constexpr std::size_t kExportBufferSize = 1 << 19;
+
 // Helper function to ensure parent directories exist
 static bool ensure_directory_exists(const std::string& filepath) {
     std::filesystem::path path(filepath);
@@ -34,7 +39,11 @@ bool USDExporter::export_usda_lines(const Tree& tree, const std::string& filepat
         return false;
     }
 
-    std::ofstream file(filepath);
+    // The buffer has to be installed before open() and must outlive the stream
+    std::vector<char> buffer(kExportBufferSize);
+    std::ofstream file;
+    file.rdbuf()->pubsetbuf(buffer.data(), buffer.size());
+    file.open(filepath);
     if (!file.is_open()) {
         std::cerr << "Failed to open file: " << filepath << std::endl;
         return false;
@@ -131,7 +140,11 @@ bool USDExporter::export_simple_format(const Tree& tree, const std::string& file
         return false;
     }
 
-    std::ofstream file(filepath);
+    // The buffer has to be installed before open() and must outlive the stream
+    std::vector<char> buffer(kExportBufferSize);
+    std::ofstream file;
+    file.rdbuf()->pubsetbuf(buffer.data(), buffer.size());
+    file.open(filepath);
     if (!file.is_open()) {
         std::cerr << "Failed to open file: " << filepath << std::endl;
         return false;
@@ -5,28 +5,22 @@
 #include "export/usd_exporter.h"
 #include <iostream>
 #include <chrono>
+#include <string>
 
 using namespace plantgrow;
 
 void print_usage(const char* program_name) {
     std::cout << "PlantGrow - Procedural Tree Generation Tool\n";
     std::cout << "Usage: " << program_name << " <config.json>\n";
+    std::cout << "       " << program_name << " --stdin-mode\n";
+    std::cout << "\nIn --stdin-mode, config paths are read from stdin (one per line) and\n";
+    std::cout << "each run is followed by a \"__DONE__ <exit_code>\" line on stdout.\n";
     std::cout << "\nExample:\n";
     std::cout << "  " << program_name << " configs/oak.json\n";
 }
 
-int main(int argc, char** argv) {
-    std::cout << "=== PlantGrow - Procedural Tree Generator ===\n";
-    std::cout << "Phase 1: Foundation & Basic Growth\n\n";
-
-    // Check arguments
-    if (argc < 2) {
-        print_usage(argv[0]);
-        return 1;
-    }
-
-    std::string config_path = argv[1];
-
+// Generate and export one tree; returns the process exit code for the run
+static int generate_tree(const std::string& config_path) {
     // Load configuration
     std::cout << "Loading configuration from: " << config_path << "\n";
     ConfigParser parser;
@@ -113,3 +107,35 @@ int main(int argc, char** argv) {
 
     return 0;
 }
+
+// Serve config paths from stdin so one process can generate many trees
+static int run_stdin_mode() {
+    std::string config_path;
+    while (std::getline(std::cin, config_path)) {
+        if (config_path.empty()) {
+            continue;
+        }
+        int exit_code = generate_tree(config_path);
+        std::cerr << std::flush;
+        std::cout << "__DONE__ " << exit_code << std::endl;
+    }
+    return 0;
+}
+
+int main(int argc, char** argv) {
+    std::cout << "=== PlantGrow - Procedural Tree Generator ===\n";
+    std::cout << "Phase 1: Foundation & Basic Growth\n\n";
+
+    // Check arguments
+    if (argc < 2) {
+        print_usage(argv[0]);
+        return 1;
+    }
+
+    std::string arg = argv[1];
+    if (arg == "--stdin-mode") {
+        return run_stdin_mode();
+    }
+
+    return generate_tree(arg);
+}